@@ -5,53 +5,557 @@ import requests
 import yt_dlp
 import io
 import os
+import argparse
 import webbrowser
 from concurrent.futures import ThreadPoolExecutor
 import threading
+import multiprocessing
 import queue
+import sqlite3
+import time
+import math
+
+# Subset of yt-dlp's progress dict that workers send back over IPC
+PROGRESS_KEYS = ('status', 'filename', 'downloaded_bytes', 'total_bytes', 'total_bytes_estimate',
+                 'speed', 'eta', 'fragment_index', 'fragment_count')
+
+# Audio modes where a bitrate setting has no effect
+LOSSLESS_AUDIO_MODES = ('original', 'remux', 'flac')
+# FFmpegExtractAudio codec -> acodec prefix yt-dlp reports for a source it can copy as-is
+AUDIO_CODEC_NAMES = {'mp3': 'mp3', 'm4a': 'mp4a', 'opus': 'opus', 'vorbis': 'vorbis'}
+
+def downloaded_path(ydl, info):
+    requested = info.get('requested_downloads') or []
+    if requested and requested[-1].get('filepath'):
+        return requested[-1]['filepath']
+    return ydl.prepare_filename(info)
+
+def process_download_worker(url, ydl_opts, conn, cancel_event, info=None):
+    # Runs in a child process: progress goes out over the pipe and the parent
+    # only replies once the bandwidth limiter lets this block through
+    conn_lock = threading.Lock()
+
+    def progress_hook(d):
+        if cancel_event.is_set():
+            raise yt_dlp.utils.DownloadCancelled()
+        # Concurrent fragment threads all call the hook, and Connection framing
+        # breaks if two of them send/recv at once
+        with conn_lock:
+            conn.send(('progress', {k: d.get(k) for k in PROGRESS_KEYS}))
+            conn.recv()
+        if cancel_event.is_set():
+            raise yt_dlp.utils.DownloadCancelled()
+
+    try:
+        with yt_dlp.YoutubeDL(dict(ydl_opts, progress_hooks=[progress_hook])) as ydl:
+            if info:
+                info = ydl.process_ie_result(info, download=True)
+            else:
+                info = ydl.extract_info(url, download=True)
+            conn.send(('done', downloaded_path(ydl, info)))
+    except yt_dlp.utils.DownloadCancelled:
+        conn.send(('cancelled', None))
+    except Exception as e:
+        conn.send(('error', str(e)))
+    finally:
+        conn.close()
+
+class MetadataIndex:
+    COLUMNS = ('id', 'title', 'uploader', 'duration', 'view_count', 'local_path',
+               'webpage_url', 'thumbnail', 'channel_url')
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS videos (
+                id TEXT PRIMARY KEY,
+                title TEXT,
+                uploader TEXT,
+                duration INTEGER,
+                view_count INTEGER,
+                local_path TEXT,
+                webpage_url TEXT,
+                thumbnail TEXT,
+                channel_url TEXT,
+                updated_at REAL
+            );
+        """)
+        # FTS5 is compiled into almost every sqlite build, fall back to LIKE if not
+        try:
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
+                    title, uploader, content='videos', content_rowid='rowid'
+                );
+                CREATE TRIGGER IF NOT EXISTS videos_ai AFTER INSERT ON videos BEGIN
+                    INSERT INTO videos_fts(rowid, title, uploader)
+                    VALUES (new.rowid, new.title, new.uploader);
+                END;
+                CREATE TRIGGER IF NOT EXISTS videos_ad AFTER DELETE ON videos BEGIN
+                    INSERT INTO videos_fts(videos_fts, rowid, title, uploader)
+                    VALUES ('delete', old.rowid, old.title, old.uploader);
+                END;
+                CREATE TRIGGER IF NOT EXISTS videos_au AFTER UPDATE ON videos BEGIN
+                    INSERT INTO videos_fts(videos_fts, rowid, title, uploader)
+                    VALUES ('delete', old.rowid, old.title, old.uploader);
+                    INSERT INTO videos_fts(rowid, title, uploader)
+                    VALUES (new.rowid, new.title, new.uploader);
+                END;
+            """)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        self.conn.commit()
+        self.closed = False
+
+    def add_videos(self, videos, local_path=None):
+        rows = []
+        now = time.time()
+        for video in videos:
+            if not video or not video.get('id'):
+                continue
+            rows.append((
+                video.get('id'),
+                video.get('title'),
+                video.get('uploader'),
+                video.get('duration'),
+                video.get('view_count'),
+                local_path,
+                video.get('webpage_url') or video.get('url'),
+                video.get('thumbnail'),
+                video.get('channel_url') or video.get('uploader_url'),
+                now,
+            ))
+        if not rows:
+            return
+        with self.lock:
+            # Downloads still running when the window closes finish after the index
+            if self.closed:
+                return
+            self.conn.executemany("""
+                INSERT INTO videos (id, title, uploader, duration, view_count, local_path,
+                                    webpage_url, thumbnail, channel_url, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    title = excluded.title,
+                    uploader = excluded.uploader,
+                    duration = excluded.duration,
+                    view_count = excluded.view_count,
+                    local_path = COALESCE(excluded.local_path, videos.local_path),
+                    webpage_url = COALESCE(excluded.webpage_url, videos.webpage_url),
+                    thumbnail = COALESCE(excluded.thumbnail, videos.thumbnail),
+                    channel_url = COALESCE(excluded.channel_url, videos.channel_url),
+                    updated_at = excluded.updated_at
+            """, rows)
+            self.conn.commit()
+
+    def search(self, query, limit=50):
+        terms = query.split()
+        if not terms:
+            return []
+        columns = ', '.join(f'videos.{c}' for c in self.COLUMNS)
+        with self.lock:
+            if self.has_fts:
+                # Quote every term so user input can't be parsed as FTS syntax
+                match = ' '.join('"{}"*'.format(t.replace('"', '""')) for t in terms)
+                rows = self.conn.execute(f"""
+                    SELECT {columns} FROM videos_fts
+                    JOIN videos ON videos.rowid = videos_fts.rowid
+                    WHERE videos_fts MATCH ?
+                    ORDER BY bm25(videos_fts)
+                    LIMIT ?
+                """, (match, limit)).fetchall()
+            else:
+                where = ' AND '.join('(title LIKE ? OR uploader LIKE ?)' for _ in terms)
+                params = []
+                for t in terms:
+                    params += [f'%{t}%', f'%{t}%']
+                rows = self.conn.execute(
+                    f"SELECT {columns} FROM videos WHERE {where} ORDER BY updated_at DESC LIMIT ?",
+                    params + [limit]
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.conn.close()
+
+def format_bytes(num):
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if num < 1024 or unit == 'GiB':
+            return f"{num:.1f} {unit}" if unit != 'B' else f"{int(num)} B"
+        num /= 1024
+
+def format_eta(seconds):
+    mins, secs = divmod(int(seconds), 60)
+    hours, mins = divmod(mins, 60)
+    if hours:
+        return f"{hours}:{mins:02d}:{secs:02d}"
+    return f"{mins}:{secs:02d}"
 
 class DownloadManager:
+    # Time constant in seconds of the speed moving average
+    SPEED_TAU = 2.0
+
     def __init__(self):
         self.active_downloads = {}
         self.download_queue = queue.Queue()
+        self.lock = threading.Lock()
         
     def add_download(self, video_id, cancel_event):
-        self.active_downloads[video_id] = {
-            'cancel_event': cancel_event,
-            'status': 'downloading'
+        with self.lock:
+            self.active_downloads[video_id] = {
+                'cancel_event': cancel_event,
+                'status': 'queued',
+                'percent': 0,
+                'downloaded_bytes': 0,
+                'total_bytes': None,
+                'speed': None,
+                'eta': None,
+                'fragment_index': None,
+                'fragment_count': None,
+                # Bytes received across all files of the job, used to measure speed
+                'received': 0,
+                'file_bytes': {},
+                'sampled_bytes': 0,
+                'sampled_at': None,
+            }
+    
+    def start_download(self, video_id):
+        with self.lock:
+            if video_id in self.active_downloads:
+                self.active_downloads[video_id]['status'] = 'downloading'
+    
+    def update_progress(self, video_id, d):
+        with self.lock:
+            job = self.active_downloads.get(video_id)
+            if job is None:
+                return
+            if d['status'] == 'finished':
+                job['percent'] = 100
+                job['eta'] = None
+                return
+            if d['status'] != 'downloading':
+                return
+            downloaded = d.get('downloaded_bytes') or 0
+            total = d.get('total_bytes') or d.get('total_bytes_estimate')
+            # The first report of a file only sets its baseline, so resumed bytes
+            # don't show up as a burst of speed
+            filename = d.get('filename')
+            seen = job['file_bytes'].setdefault(filename, downloaded)
+            if downloaded > seen:
+                job['received'] += downloaded - seen
+                job['file_bytes'][filename] = downloaded
+            job['downloaded_bytes'] = downloaded
+            job['total_bytes'] = total
+            job['fragment_index'] = d.get('fragment_index')
+            job['fragment_count'] = d.get('fragment_count')
+            if total:
+                job['percent'] = min(downloaded / total * 100, 100)
+            elif job['fragment_count']:
+                job['percent'] = (job['fragment_index'] or 0) / job['fragment_count'] * 100
+    
+    def sample_speeds(self, now):
+        # yt-dlp's own 'speed' is an average since the file started and covers a
+        # single thread with concurrent fragments, so measure bytes over time here
+        for job in self.active_downloads.values():
+            if job['status'] != 'downloading':
+                continue
+            if job['sampled_at'] is None:
+                job['sampled_at'] = now
+                job['sampled_bytes'] = job['received']
+                continue
+            elapsed = now - job['sampled_at']
+            if elapsed <= 0:
+                continue
+            rate = (job['received'] - job['sampled_bytes']) / elapsed
+            if job['speed'] is None:
+                job['speed'] = rate
+            else:
+                job['speed'] += (1 - math.exp(-elapsed / self.SPEED_TAU)) * (rate - job['speed'])
+            job['sampled_at'] = now
+            job['sampled_bytes'] = job['received']
+            if job['total_bytes'] and job['speed']:
+                job['eta'] = max(job['total_bytes'] - job['downloaded_bytes'], 0) / job['speed']
+            else:
+                job['eta'] = None
+    
+    def snapshot(self):
+        # Called from the telemetry timer, which also drives the speed sampling
+        with self.lock:
+            self.sample_speeds(time.monotonic())
+            jobs = {
+                video_id: {k: v for k, v in job.items() if k not in ('cancel_event', 'file_bytes')}
+                for video_id, job in self.active_downloads.items()
+            }
+        active = [job for job in jobs.values() if job['status'] == 'downloading']
+        return {
+            'jobs': jobs,
+            'active': len(active),
+            'queued': sum(1 for job in jobs.values() if job['status'] == 'queued'),
+            'speed': sum(job['speed'] or 0 for job in active),
         }
     
     def cancel_download(self, video_id):
-        if video_id in self.active_downloads:
-            self.active_downloads[video_id]['cancel_event'].set()
-            self.active_downloads[video_id]['status'] = 'cancelled'
-            return True
-        return False
+        with self.lock:
+            if video_id in self.active_downloads:
+                self.active_downloads[video_id]['cancel_event'].set()
+                self.active_downloads[video_id]['status'] = 'cancelled'
+                return True
+            return False
     
     def remove_download(self, video_id):
-        if video_id in self.active_downloads:
-            del self.active_downloads[video_id]
+        with self.lock:
+            if video_id in self.active_downloads:
+                del self.active_downloads[video_id]
     
     def is_downloading(self, video_id):
-        return video_id in self.active_downloads
+        with self.lock:
+            return video_id in self.active_downloads
+
+class RateBucket:
+    # Tracks cumulative bytes reserved and bytes the rate has allowed so far, so a
+    # reservation stays valid when the rate changes and only the drain speed moves
+    def __init__(self):
+        self.reserved = 0.0
+        self.allowed = 0.0
+        self.updated_at = time.monotonic()
+
+    def drain(self, rate, now, burst):
+        if rate:
+            self.allowed = min(self.allowed + rate * (now - self.updated_at), self.reserved + rate * burst)
+        else:
+            self.allowed = self.reserved
+        self.updated_at = now
+
+    def reserve(self, nbytes):
+        self.reserved += nbytes
+        return self.reserved
+
+    def remaining(self, mark, rate):
+        if not rate:
+            return 0.0
+        return max(mark - self.allowed, 0) / rate
+
+class BandwidthLimiter:
+    # Seconds of unused budget a bucket may bank for short bursts
+    BURST = 1.0
+    # Longest single wait, so limit changes reach jobs that are already throttled
+    WAIT_SLICE = 0.25
+
+    def __init__(self, global_limit=None, job_limit=None):
+        self.lock = threading.Lock()
+        self.global_limit = global_limit
+        self.job_limit = job_limit
+        self.job_limits = {}
+        self.global_bucket = RateBucket()
+        self.job_buckets = {}
+        self.seen_bytes = {}
+
+    def job_rate(self, video_id):
+        return self.job_limits.get(video_id, self.job_limit)
+
+    def drain_all(self, now):
+        self.global_bucket.drain(self.global_limit, now, self.BURST)
+        for video_id, bucket in self.job_buckets.items():
+            bucket.drain(self.job_rate(video_id), now, self.BURST)
+
+    def set_global_limit(self, limit):
+        with self.lock:
+            # Settle elapsed time at the old rate before switching
+            self.drain_all(time.monotonic())
+            self.global_limit = limit or None
+
+    def set_job_limit(self, limit, video_id=None):
+        with self.lock:
+            self.drain_all(time.monotonic())
+            if video_id is None:
+                self.job_limit = limit or None
+            elif limit:
+                self.job_limits[video_id] = limit
+            else:
+                # 0 drops the video's own cap so the default per-job cap applies again
+                self.job_limits.pop(video_id, None)
+
+    def get_job_limit(self, video_id):
+        with self.lock:
+            return self.job_limits.get(video_id)
+
+    def remove_job(self, video_id):
+        # Per-video caps are kept, they belong to the card rather than one download
+        with self.lock:
+            self.job_buckets.pop(video_id, None)
+            for key in [k for k in self.seen_bytes if k[0] == video_id]:
+                del self.seen_bytes[key]
+
+    def reserve(self, video_id, d):
+        if d['status'] != 'downloading':
+            return None
+        key = (video_id, d.get('filename'))
+        downloaded = d.get('downloaded_bytes') or 0
+        with self.lock:
+            # The first report of a resumed .part file includes bytes fetched in an
+            # earlier session, so it only sets the baseline and nothing is charged
+            if key not in self.seen_bytes:
+                self.seen_bytes[key] = downloaded
+                return None
+            delta = max(downloaded - self.seen_bytes[key], 0)
+            self.seen_bytes[key] = max(downloaded, self.seen_bytes[key])
+            if not delta:
+                return None
+            now = time.monotonic()
+            job_bucket = self.job_buckets.setdefault(video_id, RateBucket())
+            self.global_bucket.drain(self.global_limit, now, self.BURST)
+            job_bucket.drain(self.job_rate(video_id), now, self.BURST)
+            # All jobs draw from one global bucket, so idle jobs leave their share to the rest
+            return self.global_bucket.reserve(delta), job_bucket.reserve(delta)
+
+    def remaining(self, video_id, marks):
+        global_mark, job_mark = marks
+        with self.lock:
+            now = time.monotonic()
+            self.global_bucket.drain(self.global_limit, now, self.BURST)
+            wait = self.global_bucket.remaining(global_mark, self.global_limit)
+            job_bucket = self.job_buckets.get(video_id)
+            if job_bucket is not None:
+                job_bucket.drain(self.job_rate(video_id), now, self.BURST)
+                wait = max(wait, job_bucket.remaining(job_mark, self.job_rate(video_id)))
+        return wait
+
+    def throttle(self, video_id, d, cancel_event):
+        # Waiting inside the hook stalls yt-dlp's read loop for this job only.
+        # The wait is re-evaluated every slice so cancels and limit changes apply quickly
+        marks = self.reserve(video_id, d)
+        if marks is None:
+            return
+        while True:
+            wait = self.remaining(video_id, marks)
+            if wait <= 0:
+                return
+            if cancel_event.wait(min(wait, self.WAIT_SLICE)):
+                raise yt_dlp.utils.DownloadCancelled()
+
+class FormatPlanner:
+    # Search-time stream URLs expire, so only reuse the extracted info for a while
+    INFO_TTL = 30 * 60
+
+    def __init__(self):
+        self.plans = {}
+        self.fetched_at = {}
+
+    def get(self, video_info, download_type, quality):
+        self.fetched_at.setdefault(video_info.get('id'), time.time())
+        key = (video_info.get('id'), download_type, quality)
+        if key not in self.plans:
+            self.plans[key] = self.build(video_info, download_type, quality)
+        return self.plans[key]
+
+    def clear(self):
+        self.plans.clear()
+        self.fetched_at.clear()
+
+    def info_for(self, video_info):
+        fetched_at = self.fetched_at.get(video_info.get('id'))
+        if not video_info.get('formats') or fetched_at is None or time.time() - fetched_at >= self.INFO_TTL:
+            return None
+        # Same cleanup as --load-info-json: drops the search-time requested_formats,
+        # requested_downloads and filenames so only the planned format gets fetched.
+        # It also returns a fresh copy, since process_ie_result mutates what it is given
+        return yt_dlp.YoutubeDL.sanitize_info(video_info, remove_private_keys=True)
+
+    def estimate_size(self, fmt, duration):
+        size = fmt.get('filesize') or fmt.get('filesize_approx')
+        # Audio-only formats often report just abr, video-only ones just vbr
+        bitrate = fmt.get('tbr') or (fmt.get('vbr') or 0) + (fmt.get('abr') or 0)
+        if not size and bitrate and duration:
+            size = bitrate * 1000 / 8 * duration
+        return size
+
+    def build(self, video_info, download_type, quality):
+        formats = [f for f in video_info.get('formats') or [] if f.get('format_id')]
+        muxed = [f for f in formats if f.get('vcodec') not in (None, 'none') and f.get('acodec') not in (None, 'none')]
+        video_only = [f for f in formats if f.get('vcodec') not in (None, 'none') and f.get('acodec') == 'none']
+        audio_only = [f for f in formats if f.get('vcodec') == 'none' and f.get('acodec') not in (None, 'none')]
+        by_quality = lambda f: (f.get('height') or 0, f.get('tbr') or 0)
+        by_bitrate = lambda f: f.get('abr') or f.get('tbr') or 0
+
+        chosen = []
+        if download_type == "audio":
+            if audio_only:
+                chosen = [max(audio_only, key=by_bitrate)]
+        elif quality == "best" and muxed:
+            # "best" has always meant the best single-file format
+            chosen = [max(muxed, key=by_quality)]
+        else:
+            height = None if quality == "best" else int(quality.rstrip('p'))
+            fits = lambda f: height is None or (f.get('height') or 0) <= height
+            candidates = [f for f in video_only + muxed if fits(f)]
+            if candidates:
+                target = max(f.get('height') or 0 for f in candidates)
+                full = [f for f in muxed if fits(f) and (f.get('height') or 0) >= target]
+                if full:
+                    # A muxed file at the same height needs no ffmpeg merge
+                    chosen = [max(full, key=by_quality)]
+                elif audio_only:
+                    video = max((f for f in video_only if fits(f)), key=by_quality)
+                    # Matching containers let ffmpeg merge without falling back to mkv
+                    same_ext = [f for f in audio_only if f.get('ext') == {'mp4': 'm4a'}.get(video.get('ext'), video.get('ext'))]
+                    chosen = [video, max(same_ext or audio_only, key=by_bitrate)]
+
+        if not chosen:
+            return None
+
+        sizes = [self.estimate_size(f, video_info.get('duration')) for f in chosen]
+        return {
+            'format_id': '+'.join(f['format_id'] for f in chosen),
+            'height': chosen[0].get('height'),
+            'ext': chosen[0].get('ext'),
+            'acodec': chosen[-1].get('acodec'),
+            'abr': chosen[-1].get('abr'),
+            'size': sum(size for size in sizes if size) or None,
+            'size_partial': not all(sizes),
+            'merge': len(chosen) > 1,
+        }
+
+def describe_plan(plan):
+    if plan is None:
+        return ""
+    if plan['height']:
+        text = f"Plan: {plan['height']}p {plan['ext']}"
+    else:
+        text = f"Plan: {(plan['acodec'] or plan['ext']).split('.')[0]} audio"
+        if plan['abr']:
+            text += f" {int(plan['abr'])}k"
+    if plan['size']:
+        text += f"   ~{format_bytes(plan['size'])}"
+        if plan['size_partial']:
+            text += "+"
+    text += "   needs merge" if plan['merge'] else "   no merge"
+    return text
 
 class VideoCard(ttk.Frame):
-    def __init__(self, parent, video_info, download_callback, cancel_callback, open_channel_callback, theme, **kwargs):
+    def __init__(self, parent, video_info, download_callback, cancel_callback, open_channel_callback, theme,
+                 rate_limit_callback=None, rate_limit=0, **kwargs):
         super().__init__(parent, **kwargs)
         self.video_info = video_info
         self.download_callback = download_callback
         self.cancel_callback = cancel_callback
         self.open_channel_callback = open_channel_callback
+        self.rate_limit_callback = rate_limit_callback
         self.theme = theme
         self.thumbnail_img = None
         self.is_downloading = False
         self.progress_var = tk.DoubleVar()
+        self.rate_limit_var = tk.StringVar(value=str(rate_limit))
         
         self.config(style='Card.TFrame', padding=10)
         
         # Left side - Thumbnail
         self.thumbnail_label = tk.Label(self, bg=self.theme['card_bg'])
-        self.thumbnail_label.grid(row=0, column=0, rowspan=5, padx=(0, 15), sticky='n')
+        self.thumbnail_label.grid(row=0, column=0, rowspan=6, padx=(0, 15), sticky='n')
         
         # Right side - Info
         title_text = video_info.get('title', 'No title')
@@ -95,6 +599,9 @@ class VideoCard(ttk.Frame):
             views_str = ""
         
         info_text = f"{duration_str}   {views_str}"
+        local_path = video_info.get('local_path')
+        if local_path and os.path.exists(local_path):
+            info_text += "   Saved locally"
         self.info_label = ttk.Label(
             self, 
             text=info_text, 
@@ -104,9 +611,18 @@ class VideoCard(ttk.Frame):
         )
         self.info_label.grid(row=2, column=1, sticky='w', pady=2)
         
+        self.plan_label = ttk.Label(
+            self, 
+            text="", 
+            font=('Iosevka', 9),
+            foreground=self.theme['text_fg'],
+            style='CardText.TLabel'
+        )
+        self.plan_label.grid(row=3, column=1, sticky='w', pady=2)
+        
         # Progress bar (initially hidden)
         self.progress_frame = ttk.Frame(self, style='Card.TFrame')
-        self.progress_frame.grid(row=3, column=1, sticky='ew', pady=(5, 5))
+        self.progress_frame.grid(row=4, column=1, sticky='ew', pady=(5, 5))
         self.progress_frame.grid_remove()
         
         self.progress_bar = ttk.Progressbar(
@@ -128,7 +644,7 @@ class VideoCard(ttk.Frame):
         
         # Buttons frame
         btn_frame = ttk.Frame(self, style='Card.TFrame')
-        btn_frame.grid(row=4, column=1, sticky='w', pady=(10, 0))
+        btn_frame.grid(row=5, column=1, sticky='w', pady=(10, 0))
         
         self.download_btn = ttk.Button(
             btn_frame, 
@@ -157,6 +673,24 @@ class VideoCard(ttk.Frame):
         )
         self.channel_btn.pack(side=tk.LEFT)
         
+        # Per-video bandwidth cap, 0 falls back to the global per-job cap
+        ttk.Label(btn_frame, text="Cap (KiB/s):", style='CardText.TLabel').pack(side=tk.LEFT, padx=(15, 5))
+        # Applied on Return, focus-out or the arrows, not per keystroke, so typing
+        # "2048" doesn't briefly throttle the job to 2 KiB/s
+        rate_spinbox = ttk.Spinbox(
+            btn_frame,
+            from_=0,
+            to=1000000,
+            increment=128,
+            textvariable=self.rate_limit_var,
+            command=self.on_rate_limit,
+            width=8,
+            font=('Iosevka', 10)
+        )
+        rate_spinbox.pack(side=tk.LEFT)
+        rate_spinbox.bind('<Return>', lambda e: self.on_rate_limit())
+        rate_spinbox.bind('<FocusOut>', lambda e: self.on_rate_limit())
+        
         # Load thumbnail
         self.load_thumbnail()
         
@@ -186,9 +720,17 @@ class VideoCard(ttk.Frame):
         self.progress_var.set(0)
         self.progress_label.config(text="0%")
     
-    def update_progress(self, percent):
+    def set_plan(self, text):
+        self.plan_label.config(text=text)
+    
+    def update_progress(self, percent, speed=None, eta=None):
         self.progress_var.set(percent)
-        self.progress_label.config(text=f"{int(percent)}%")
+        text = f"{int(percent)}%"
+        if speed:
+            text += f"  {format_bytes(speed)}/s"
+        if eta is not None:
+            text += f"  ETA {format_eta(eta)}"
+        self.progress_label.config(text=text)
     
     def on_download(self):
         self.download_callback(self.video_info, self)
@@ -198,9 +740,16 @@ class VideoCard(ttk.Frame):
     
     def on_channel_click(self):
         self.open_channel_callback(self.video_info)
+    
+    def on_rate_limit(self):
+        if self.rate_limit_callback:
+            self.rate_limit_callback(self.video_info, self.rate_limit_var.get())
 
 class YouTubeDownloader(tk.Tk):
-    def __init__(self):
+    # Milliseconds between progress/telemetry redraws
+    TELEMETRY_INTERVAL = 500
+
+    def __init__(self, rate_limit=None, job_rate_limit=None, fragments=1, process_workers=False):
         super().__init__()
 
         self.title("Pogg - YouTube Downloader")
@@ -214,12 +763,30 @@ class YouTubeDownloader(tk.Tk):
         self.search_var = tk.StringVar()
         self.download_type = tk.StringVar(value="video")
         self.download_quality = tk.StringVar(value="best")
+        self.format_planner = FormatPlanner()
+        self.audio_codec = tk.StringVar(value="remux")
+        self.audio_bitrate = tk.StringVar(value="192")
         self.download_folder = os.path.join(os.path.expanduser("~"), "media", "Videos", "Downloads")
         self.video_cards = []
         self.executor = ThreadPoolExecutor(max_workers=3)
         self.num_results = tk.StringVar(value="50")
         self.dark_mode = tk.BooleanVar(value=True)
         self.download_manager = DownloadManager()
+        self.search_source = tk.StringVar(value="online")
+        self.bandwidth_limiter = BandwidthLimiter(rate_limit, job_rate_limit)
+        self.rate_limit = tk.StringVar(value=str((rate_limit or 0) // 1024))
+        self.job_rate_limit = tk.StringVar(value=str((job_rate_limit or 0) // 1024))
+        self.fragments = tk.StringVar(value=str(fragments))
+        self.download_type.trace_add('write', lambda *args: self.refresh_format_plans())
+        self.download_type.trace_add('write', lambda *args: self.update_bitrate_state())
+        self.audio_codec.trace_add('write', lambda *args: self.update_bitrate_state())
+        self.download_quality.trace_add('write', lambda *args: self.refresh_format_plans())
+        self.process_workers = tk.BooleanVar(value=process_workers)
+        # spawn, not fork: forking a process that holds Tk and worker threads is unsafe
+        self.mp_context = multiprocessing.get_context('spawn')
+        self.metadata_index = MetadataIndex(
+            os.path.join(os.path.expanduser("~"), ".cache", "pogg", "index.db")
+        )
 
         # Create download folder if it doesn't exist
         os.makedirs(self.download_folder, exist_ok=True)
@@ -264,6 +831,7 @@ class YouTubeDownloader(tk.Tk):
         self.apply_theme()
         self.create_widgets()
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.after(self.TELEMETRY_INTERVAL, self.refresh_telemetry)
 
     def apply_theme(self):
         theme = self.current_theme
@@ -408,10 +976,28 @@ class YouTubeDownloader(tk.Tk):
                     self.download_video,
                     self.cancel_download,
                     self.open_channel,
-                    self.current_theme
+                    self.current_theme,
+                    self.set_video_rate_limit,
+                    (self.bandwidth_limiter.get_job_limit(video.get('id')) or 0) // 1024
                 )
                 card.pack(fill=tk.X, pady=5, padx=5)
                 self.video_cards.append(card)
+            self.refresh_format_plans()
+
+    def update_bitrate_state(self):
+        # Bitrate only matters when audio is actually re-encoded
+        if not hasattr(self, 'bitrate_combo'):
+            return
+        if self.download_type.get() == "audio" and self.audio_codec.get() not in LOSSLESS_AUDIO_MODES:
+            self.bitrate_combo.config(state="readonly")
+        else:
+            self.bitrate_combo.config(state="disabled")
+
+    def refresh_format_plans(self):
+        # Plans are cached per video, so switching quality back and forth is free
+        for card in self.video_cards:
+            plan = self.format_planner.get(card.video_info, self.download_type.get(), self.download_quality.get())
+            card.set_plan(describe_plan(plan))
 
     def create_widgets(self):
         # Main container with grid
@@ -487,6 +1073,19 @@ class YouTubeDownloader(tk.Tk):
         )
         results_spinbox.pack(side=tk.LEFT)
 
+        ttk.Label(results_count_frame, text="Source:", font=('Iosevka', 10)).pack(side=tk.LEFT, padx=(30, 10))
+
+        source_combo = ttk.Combobox(
+            results_count_frame,
+            textvariable=self.search_source,
+            values=["online", "local", "both"],
+            state="readonly",
+            width=10,
+            font=('Iosevka', 10),
+            style='TCombobox'
+        )
+        source_combo.pack(side=tk.LEFT)
+
         # Options section
         options_frame = ttk.LabelFrame(main_container, text="Download Options", padding=15)
         options_frame.grid(row=2, column=0, sticky='ew', pady=(0, 15))
@@ -505,7 +1104,7 @@ class YouTubeDownloader(tk.Tk):
         ).pack(side=tk.LEFT, padx=10)
         ttk.Radiobutton(
             format_frame, 
-            text="Audio (MP3)", 
+            text="Audio", 
             variable=self.download_type, 
             value="audio"
         ).pack(side=tk.LEFT, padx=10)
@@ -527,12 +1126,41 @@ class YouTubeDownloader(tk.Tk):
         )
         quality_combo.pack(side=tk.LEFT)
 
+        # Audio codec: "original" keeps the downloaded stream untouched, "remux"
+        # copies it into a plain audio container, anything else re-encodes
+        audio_frame = ttk.Frame(options_frame)
+        audio_frame.grid(row=1, column=0, columnspan=3, sticky='w', pady=(0, 10))
+
+        ttk.Label(audio_frame, text="Audio Codec:", font=('Iosevka', 11, 'bold')).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Combobox(
+            audio_frame,
+            textvariable=self.audio_codec,
+            values=["original", "remux", "mp3", "m4a", "opus", "vorbis", "flac"],
+            state="readonly",
+            width=10,
+            font=('Iosevka', 10),
+            style='TCombobox'
+        ).pack(side=tk.LEFT)
+
+        ttk.Label(audio_frame, text="Bitrate (kbps):", font=('Iosevka', 11, 'bold')).pack(side=tk.LEFT, padx=(30, 10))
+        self.bitrate_combo = ttk.Combobox(
+            audio_frame,
+            textvariable=self.audio_bitrate,
+            values=["96", "128", "160", "192", "256", "320"],
+            state="readonly",
+            width=8,
+            font=('Iosevka', 10),
+            style='TCombobox'
+        )
+        self.bitrate_combo.pack(side=tk.LEFT)
+        self.update_bitrate_state()
+
         # Download location
         ttk.Label(
             options_frame, 
             text="Download Folder:", 
             font=('Iosevka', 11, 'bold')
-        ).grid(row=1, column=0, sticky='w', padx=(0, 10))
+        ).grid(row=2, column=0, sticky='w', padx=(0, 10))
 
         self.folder_label = ttk.Label(
             options_frame, 
@@ -542,7 +1170,7 @@ class YouTubeDownloader(tk.Tk):
             foreground=self.current_theme['accent'],
             font=('Iosevka', 10)
         )
-        self.folder_label.grid(row=1, column=1, sticky='ew', padx=(0, 10))
+        self.folder_label.grid(row=2, column=1, sticky='ew', padx=(0, 10))
 
         folder_btn = ttk.Button(
             options_frame, 
@@ -550,7 +1178,61 @@ class YouTubeDownloader(tk.Tk):
             command=self.choose_folder,
             width=12
         )
-        folder_btn.grid(row=1, column=2)
+        folder_btn.grid(row=2, column=2)
+
+        # Bandwidth limits, applied live to running downloads once a value is
+        # committed (Return, focus-out or the arrows) rather than on every keystroke
+        bandwidth_frame = ttk.Frame(options_frame)
+        bandwidth_frame.grid(row=3, column=0, columnspan=3, sticky='w', pady=(10, 0))
+
+        ttk.Label(bandwidth_frame, text="Limit (KiB/s):", font=('Iosevka', 11, 'bold')).pack(side=tk.LEFT, padx=(0, 10))
+        rate_limit_spinbox = ttk.Spinbox(
+            bandwidth_frame,
+            from_=0,
+            to=1000000,
+            increment=128,
+            textvariable=self.rate_limit,
+            command=self.apply_rate_limits,
+            width=10,
+            font=('Iosevka', 10)
+        )
+        rate_limit_spinbox.pack(side=tk.LEFT)
+        rate_limit_spinbox.bind('<Return>', lambda e: self.apply_rate_limits())
+        rate_limit_spinbox.bind('<FocusOut>', lambda e: self.apply_rate_limits())
+
+        ttk.Label(bandwidth_frame, text="Per job:", font=('Iosevka', 10)).pack(side=tk.LEFT, padx=(20, 10))
+        job_rate_limit_spinbox = ttk.Spinbox(
+            bandwidth_frame,
+            from_=0,
+            to=1000000,
+            increment=128,
+            textvariable=self.job_rate_limit,
+            command=self.apply_rate_limits,
+            width=10,
+            font=('Iosevka', 10)
+        )
+        job_rate_limit_spinbox.pack(side=tk.LEFT)
+        job_rate_limit_spinbox.bind('<Return>', lambda e: self.apply_rate_limits())
+        job_rate_limit_spinbox.bind('<FocusOut>', lambda e: self.apply_rate_limits())
+
+        ttk.Label(bandwidth_frame, text="Fragments:", font=('Iosevka', 10)).pack(side=tk.LEFT, padx=(20, 10))
+        ttk.Spinbox(
+            bandwidth_frame,
+            from_=1,
+            to=16,
+            textvariable=self.fragments,
+            width=5,
+            font=('Iosevka', 10)
+        ).pack(side=tk.LEFT)
+
+        ttk.Label(bandwidth_frame, text="(0 = unlimited)", font=('Iosevka', 9)).pack(side=tk.LEFT, padx=(10, 0))
+
+        ttk.Checkbutton(
+            bandwidth_frame,
+            text="Separate processes",
+            variable=self.process_workers,
+            style='TCheckbutton'
+        ).pack(side=tk.LEFT, padx=(20, 0))
 
         # Results section with scrollbar
         results_label_frame = ttk.LabelFrame(main_container, text="Search Results", padding=10)
@@ -598,6 +1280,14 @@ class YouTubeDownloader(tk.Tk):
             font=('Iosevka', 10)
         )
         self.status_label.pack(side=tk.LEFT)
+        
+        self.telemetry_label = ttk.Label(
+            status_frame, 
+            text="", 
+            foreground=self.current_theme['text_fg'],
+            font=('Iosevka', 10)
+        )
+        self.telemetry_label.pack(side=tk.RIGHT)
 
     def on_canvas_configure(self, event):
         canvas_width = event.width
@@ -614,6 +1304,22 @@ class YouTubeDownloader(tk.Tk):
         elif event.num == 4 or event.delta > 0:
             self.canvas.yview_scroll(-1, "units")
 
+    def apply_rate_limits(self):
+        try:
+            rate_limit = int(self.rate_limit.get()) * 1024
+            job_rate_limit = int(self.job_rate_limit.get()) * 1024
+        except ValueError:
+            return
+        self.bandwidth_limiter.set_global_limit(rate_limit)
+        self.bandwidth_limiter.set_job_limit(job_rate_limit)
+
+    def set_video_rate_limit(self, video_info, value):
+        try:
+            rate_limit = int(value) * 1024
+        except ValueError:
+            return
+        self.bandwidth_limiter.set_job_limit(rate_limit, video_info.get('id'))
+
     def choose_folder(self):
         folder = filedialog.askdirectory(initialdir=self.download_folder)
         if folder:
@@ -630,6 +1336,7 @@ class YouTubeDownloader(tk.Tk):
         for card in self.video_cards:
             card.destroy()
         self.video_cards.clear()
+        self.format_planner.clear()
 
         self.status_label.config(text="Searching...", foreground=self.current_theme['accent'])
         self.update()
@@ -639,43 +1346,73 @@ class YouTubeDownloader(tk.Tk):
         except ValueError:
             num_results = 50
 
-        ydl_opts = {
-            "quiet": True,
-            "skip_download": True,
-            "no_warnings": True,
-        }
+        source = self.search_source.get()
+        videos = []
+        positions = {}
 
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                result = ydl.extract_info(f"ytsearch{num_results}:{query}", download=False)
-                videos = result.get("entries", [])
-                
+        if source in ("local", "both"):
+            try:
+                for video in self.metadata_index.search(query, num_results):
+                    positions[video['id']] = len(videos)
+                    videos.append(video)
+            except sqlite3.Error as e:
+                self.status_label.config(text=f"Index error: {str(e)}", foreground="red")
+                return
+
+        if source in ("online", "both"):
+            ydl_opts = {
+                "quiet": True,
+                "skip_download": True,
+                "no_warnings": True,
+            }
+
+            try:
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    result = ydl.extract_info(f"ytsearch{num_results}:{query}", download=False)
+                    remote = [v for v in result.get("entries", []) if v]
+                    self.metadata_index.add_videos(remote)
+                    for video in remote:
+                        index = positions.get(video.get('id'))
+                        if index is None:
+                            positions[video.get('id')] = len(videos)
+                            videos.append(video)
+                        else:
+                            # The fresh entry has formats and current metadata, the
+                            # index row only contributes where it was saved
+                            if videos[index].get('local_path'):
+                                video['local_path'] = videos[index]['local_path']
+                            videos[index] = video
+            except Exception as e:
+                # Local hits are still worth showing when offline
                 if not videos:
-                    self.status_label.config(text="No results found", foreground="red")
+                    self.status_label.config(text=f"Error: {str(e)}", foreground="red")
                     return
-                
-                for idx, video in enumerate(videos):
-                    if video:
-                        card = VideoCard(
-                            self.scrollable_frame, 
-                            video, 
-                            self.download_video,
-                            self.cancel_download,
-                            self.open_channel,
-                            self.current_theme
-                        )
-                        card.pack(fill=tk.X, pady=5, padx=5)
-                        self.video_cards.append(card)
-                
-                self.status_label.config(
-                    text=f"Found {len(self.video_cards)} results!", 
-                    foreground="green"
-                )
-                
-                self.canvas.yview_moveto(0)
-                
-        except Exception as e:
-            self.status_label.config(text=f"Error: {str(e)}", foreground="red")
+
+        if not videos:
+            self.status_label.config(text="No results found", foreground="red")
+            return
+
+        for video in videos:
+            card = VideoCard(
+                self.scrollable_frame, 
+                video, 
+                self.download_video,
+                self.cancel_download,
+                self.open_channel,
+                self.current_theme,
+                self.set_video_rate_limit,
+                (self.bandwidth_limiter.get_job_limit(video.get('id')) or 0) // 1024
+            )
+            card.pack(fill=tk.X, pady=5, padx=5)
+            self.video_cards.append(card)
+        self.refresh_format_plans()
+
+        self.status_label.config(
+            text=f"Found {len(self.video_cards)} results!", 
+            foreground="green"
+        )
+
+        self.canvas.yview_moveto(0)
 
     def open_channel(self, video_info):
         channel_url = video_info.get('channel_url') or video_info.get('uploader_url')
@@ -713,70 +1450,178 @@ class YouTubeDownloader(tk.Tk):
                 height = quality.rstrip('p')
                 format_choice = f"bestvideo[height<={height}]+bestaudio/best[height<={height}]"
 
+        plan = self.format_planner.get(video_info, self.download_type.get(), quality)
+        info = self.format_planner.info_for(video_info) if plan else None
+        if plan:
+            # Keep the generic selector as a fallback in case the planned ids are gone
+            format_choice = f"{plan['format_id']}/{format_choice}"
+
+        try:
+            fragments = max(int(self.fragments.get()), 1)
+        except ValueError:
+            fragments = 1
+
         ydl_opts = {
             "format": format_choice,
             "outtmpl": os.path.join(self.download_folder, "%(title)s.%(ext)s"),
             "quiet": True,
             "no_warnings": True,
-            "progress_hooks": [lambda d: self.progress_hook(d, card)],
+            "concurrent_fragment_downloads": fragments,
+            # Fixed read size keeps throttled bursts short when limits change mid-download
+            "buffersize": 256 * 1024,
+            "noresizebuffer": True,
         }
 
         if self.download_type.get() == "audio":
-            ydl_opts["postprocessors"] = [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }]
+            audio_codec = self.audio_codec.get()
+            if audio_codec == "remux":
+                # 'best' makes ffmpeg copy the stream, only the container changes
+                ydl_opts["postprocessors"] = [{
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': 'best',
+                }]
+            elif audio_codec != "original":
+                postprocessor = {
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': audio_codec,
+                }
+                # yt-dlp copies the stream when the source already has the target
+                # codec, so only pass a bitrate when it will really transcode
+                source_codec = ((plan or {}).get('acodec') or '').split('.')[0]
+                if audio_codec not in LOSSLESS_AUDIO_MODES and source_codec != AUDIO_CODEC_NAMES.get(audio_codec):
+                    postprocessor['preferredquality'] = self.audio_bitrate.get()
+                ydl_opts["postprocessors"] = [postprocessor]
 
-        cancel_event = threading.Event()
+        use_processes = self.process_workers.get()
+        url = video_info["webpage_url"]
+        if use_processes:
+            cancel_event = self.mp_context.Event()
+        else:
+            cancel_event = threading.Event()
         self.download_manager.add_download(video_id, cancel_event)
 
         def download_task():
+            self.download_manager.start_download(video_id)
             try:
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    if not cancel_event.is_set():
-                        ydl.download([video_info["webpage_url"]])
-                    
-                    if cancel_event.is_set():
-                        self.after(0, lambda: card.hide_progress())
-                        self.download_manager.remove_download(video_id)
-                        return
-                    
+                local_path = None
+                if not cancel_event.is_set():
+                    if use_processes:
+                        local_path = self.run_download_process(video_id, url, ydl_opts, cancel_event, info)
+                    else:
+                        local_path = self.run_download_thread(video_id, url, ydl_opts, cancel_event, info)
+                
+                if cancel_event.is_set():
                     self.after(0, lambda: card.hide_progress())
-                    self.after(0, lambda: self.status_label.config(
-                        text="Download completed!", 
-                        foreground="green"
-                    ))
-                    self.after(0, lambda: messagebox.showinfo(
-                        "Success", 
-                        f"Downloaded: {video_info['title'][:60]}\n\nSaved to: {self.download_folder}"
-                    ))
-                    self.download_manager.remove_download(video_id)
+                    return
+                
+                if local_path:
+                    video_info['local_path'] = local_path
+                    self.metadata_index.add_videos([video_info], local_path=local_path)
+                
+                self.after(0, lambda: card.hide_progress())
+                self.after(0, lambda: self.status_label.config(
+                    text="Download completed!", 
+                    foreground="green"
+                ))
+                self.after(0, lambda: messagebox.showinfo(
+                    "Success", 
+                    f"Downloaded: {video_info['title'][:60]}\n\nSaved to: {self.download_folder}"
+                ))
                     
             except Exception as e:
+                error = str(e)
+                self.after(0, lambda: card.hide_progress())
                 if not cancel_event.is_set():
-                    self.after(0, lambda: card.hide_progress())
                     self.after(0, lambda: self.status_label.config(
-                        text=f"Error: {str(e)}", 
+                        text=f"Error: {error}", 
                         foreground="red"
                     ))
                     self.after(0, lambda: messagebox.showerror(
                         "Error", 
-                        f"Download failed: {str(e)}"
+                        f"Download failed: {error}"
                     ))
+            finally:
                 self.download_manager.remove_download(video_id)
+                self.bandwidth_limiter.remove_job(video_id)
 
         self.executor.submit(download_task)
 
-    def progress_hook(self, d, card):
-        if d['status'] == 'downloading':
+    def run_download_thread(self, video_id, url, ydl_opts, cancel_event, info=None):
+        def progress_hook(d):
+            if cancel_event.is_set():
+                raise yt_dlp.utils.DownloadCancelled()
+            self.download_manager.update_progress(video_id, d)
+            self.bandwidth_limiter.throttle(video_id, d, cancel_event)
+
+        with yt_dlp.YoutubeDL(dict(ydl_opts, progress_hooks=[progress_hook])) as ydl:
+            # Reusing the search-time info skips a second extraction round trip
+            if info:
+                info = ydl.process_ie_result(info, download=True)
+            else:
+                info = ydl.extract_info(url, download=True)
+            return downloaded_path(ydl, info)
+
+    def run_download_process(self, video_id, url, ydl_opts, cancel_event, info=None):
+        # The executor thread only relays small progress messages, yt-dlp itself
+        # runs in the child so it never competes with the Tk main loop
+        parent_conn, child_conn = self.mp_context.Pipe()
+        process = self.mp_context.Process(
+            target=process_download_worker,
+            args=(url, ydl_opts, child_conn, cancel_event, info),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        
+        result = None
+        while result is None:
             try:
-                percent = d.get('downloaded_bytes', 0) / d.get('total_bytes', 1) * 100
-                self.after(0, lambda: card.update_progress(percent))
-            except:
-                pass
-        elif d['status'] == 'finished':
-            self.after(0, lambda: card.update_progress(100))
+                kind, payload = parent_conn.recv()
+            except EOFError:
+                break
+            if kind == 'progress':
+                self.download_manager.update_progress(video_id, payload)
+                try:
+                    self.bandwidth_limiter.throttle(video_id, payload, cancel_event)
+                except yt_dlp.utils.DownloadCancelled:
+                    # The worker checks the event itself once it gets the reply
+                    pass
+                try:
+                    parent_conn.send(None)
+                except OSError:
+                    pass
+            else:
+                result = (kind, payload)
+        
+        process.join()
+        parent_conn.close()
+        if result is None:
+            raise RuntimeError(f"Download worker exited unexpectedly (code {process.exitcode})")
+        kind, payload = result
+        if kind == 'error':
+            raise RuntimeError(payload)
+        return payload
+
+    def refresh_telemetry(self):
+        # Progress hooks only record stats, all redraws happen here on one timer
+        stats = self.download_manager.snapshot()
+        jobs = stats['jobs']
+        for card in self.video_cards:
+            job = jobs.get(card.video_info.get('id'))
+            if job and card.is_downloading:
+                if job['status'] == 'queued':
+                    card.progress_label.config(text="Queued")
+                else:
+                    card.update_progress(job['percent'], job['speed'], job['eta'])
+        
+        if jobs:
+            self.telemetry_label.config(
+                text=f"Active: {stats['active']}   Queued: {stats['queued']}   "
+                     f"Total: {format_bytes(stats['speed'])}/s"
+            )
+        else:
+            self.telemetry_label.config(text="")
+        self.after(self.TELEMETRY_INTERVAL, self.refresh_telemetry)
 
     def on_closing(self):
         # Cancel all active downloads
@@ -784,10 +1629,31 @@ class YouTubeDownloader(tk.Tk):
             self.download_manager.cancel_download(video_id)
         
         self.executor.shutdown(wait=False)
+        self.metadata_index.close()
         self.destroy()
 
 
+def rate_arg(value):
+    rate = yt_dlp.utils.parse_bytes(value)
+    if rate is None:
+        raise argparse.ArgumentTypeError(f"invalid rate: {value!r} (expected e.g. 500K or 2M)")
+    return rate
+
+
 if __name__ == "__main__":
-    app = YouTubeDownloader()
+    # Frozen (pyinstaller) builds would otherwise relaunch the GUI for every worker
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Pogg - YouTube Downloader")
+    parser.add_argument("--limit-rate", type=rate_arg,
+                        help="total bandwidth shared by all downloads, e.g. 2M")
+    parser.add_argument("--job-limit-rate", type=rate_arg,
+                        help="bandwidth cap for each download, e.g. 500K")
+    parser.add_argument("--fragments", type=int, default=1,
+                        help="fragments fetched concurrently for HLS/DASH downloads")
+    parser.add_argument("--process-workers", action="store_true",
+                        help="run each download in its own process")
+    args = parser.parse_args()
+
+    app = YouTubeDownloader(args.limit_rate, args.job_limit_rate, args.fragments, args.process_workers)
     app.mainloop()
 